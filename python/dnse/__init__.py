@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from .api._version import __version__ as APIVersion
 from .api.client import DNSEClient
+from .api.async_client import AsyncDNSEClient
 from .websocket._version import __version__ as WSVersion
 from .websocket.client import TradingClient
 from .websocket.exceptions import (
@@ -14,6 +15,7 @@ from .websocket.exceptions import (
 
 __all__ = [
     "DNSEClient",
+    "AsyncDNSEClient",
     "APIVersion",
     "WSVersion",
     "TradingClient",
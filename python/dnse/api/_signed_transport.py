@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import json
+import os
+from datetime import datetime, timezone
+from urllib import parse
+from uuid import uuid4
+
+import urllib3
+
+from .common import build_signature, get_api_version, get_date_header_name
+
+_DEBUG = os.getenv("DEBUG", "").lower() == "true"
+
+# PoolManager dùng chung cho send_signed_request, giữ kết nối keep-alive giữa các lần gọi
+_http = None
+
+
+def _get_http():
+    global _http
+    if _http is None:
+        _http = urllib3.PoolManager(
+            num_pools=4,
+            maxsize=32,
+            block=False,
+            timeout=urllib3.Timeout(connect=30.0, read=60.0),
+        )
+    return _http
+
+
+def send_signed_request(
+    url,
+    method,
+    headers,
+    body,
+    api_key,
+    api_secret,
+    algorithm="hmac-sha256",
+    hmac_nonce_enabled=True,
+):
+    headers = dict(headers or {})
+    headers.setdefault("version", get_api_version())
+    parsed = parse.urlparse(url)
+    path = parsed.path
+    date_value = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z")
+    date_header_name = get_date_header_name()
+
+    nonce = uuid4().hex if hmac_nonce_enabled else None
+    headers_list, signature = build_signature(
+        api_secret,
+        method,
+        path,
+        date_value,
+        algorithm,
+        nonce=nonce,
+        header_name=date_header_name,
+    )
+    signature_header_value = (
+        f'Signature keyId="{api_key}",algorithm="{algorithm}",'
+        f'headers="{headers_list}",signature="{signature}"'
+    )
+    if nonce:
+        signature_header_value += f',nonce="{nonce}"'
+
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode("utf-8")
+        headers.setdefault("Content-Type", "application/json")
+
+    req_headers = {
+        date_header_name: date_value,
+        "X-Signature": signature_header_value,
+    }
+    req_headers.update(headers)
+
+    if _DEBUG:
+        query_params = parse.parse_qs(parsed.query)
+        print("DEBUG url:", url)
+        print("DEBUG method:", method)
+        print("DEBUG query_params:", query_params)
+        print("DEBUG headers:", req_headers)
+        print("DEBUG body:", body)
+
+    resp = _get_http().request(method, url, body=data, headers=req_headers)
+    body_text = resp.data.decode("utf-8") if resp.data else ""
+    if resp.status >= 400:
+        print(f"HTTP {resp.status} {resp.reason}")
+        if body_text:
+            print(body_text)
+    else:
+        print(body_text)
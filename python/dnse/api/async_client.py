@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import asyncio
+
+from .client import DNSEClient
+
+
+class AsyncDNSEClient(DNSEClient):
+    """Phiên bản async của DNSEClient, chạy trên httpx.AsyncClient.
+
+    Mọi hàm API giữ nguyên tham số như DNSEClient nhưng trả về coroutine, nên có thể
+    gửi song song trên cùng một kết nối:
+
+        status_body = await asyncio.gather(
+            client.get_balances(account_no),
+            client.get_orders(account_no, "STOCK"),
+        )
+    """
+
+    def __init__(
+            self,
+            api_key,
+            api_secret,
+            base_url="https://openapi.dnse.com.vn",
+            algorithm="hmac-sha256",
+            hmac_nonce_enabled=True,
+            api_version=None,
+            parse_json=False,
+            http2=True,
+    ):
+        self._http2 = http2
+        super().__init__(
+            api_key,
+            api_secret,
+            base_url=base_url,
+            algorithm=algorithm,
+            hmac_nonce_enabled=hmac_nonce_enabled,
+            api_version=api_version,
+            parse_json=parse_json,
+        )
+
+    def _create_http(self):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("AsyncDNSEClient cần httpx: pip install 'httpx[http2]'") from e
+
+        http2 = self._http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                # Thiếu gói h2 thì quay về HTTP/1.1 keep-alive
+                http2 = False
+
+        return httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(60.0, connect=30.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+
+    async def _request(self, method, path, query=None, body=None, headers=None, dry_run=False):
+        url, req_headers, data = self._prepare_request(method, path, query, body, headers, dry_run)
+
+        if dry_run:
+            return None, None
+
+        resp = await self._http.request(method, url, content=data, headers=req_headers)
+        return resp.status_code, self._read_body(resp.content)
+
+    async def post_orders_batch(self, market_type, payloads, trading_token, order_category="NORMAL", dry_run=False):
+        """Như DNSEClient.post_orders_batch: mỗi phần tử là kết quả hoặc exception của lệnh tương ứng."""
+        # Gửi đồng thời (các stream HTTP/2 trên cùng kết nối); return_exceptions giữ kết quả
+        # của các lệnh đã gửi thành công khi có lệnh khác lỗi
+        return list(await asyncio.gather(*(
+            self.post_order(market_type, payload, trading_token, order_category=order_category, dry_run=dry_run)
+            for payload in payloads
+        ), return_exceptions=True))
+
+    async def aclose(self):
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
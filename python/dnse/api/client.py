@@ -1,11 +1,68 @@
 #!/usr/bin/env python3
+import itertools
 import json
 import os
+import re
+import time
 from urllib import parse
 import urllib3
 
+try:
+    import orjson
 
-from .common import build_signature, get_api_version, get_date_header_name
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # orjson là tuỳ chọn, fallback về json chuẩn
+    def _dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+from .common import get_api_version, get_date_header_name, hmac_prototype, sign_with_prototype
+
+# Nonce chỉ cần duy nhất theo key: PID + monotonic_ns + bộ đếm tăng dần
+_NONCE_COUNTER = itertools.count()
+_NONCE_PID = os.getpid()
+
+
+def _reset_nonce_state():
+    # Process con fork sau khi import (gunicorn, multiprocessing) phải có PID và bộ đếm riêng
+    global _NONCE_COUNTER, _NONCE_PID
+    _NONCE_COUNTER = itertools.count()
+    _NONCE_PID = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):  # Không có trên Windows, nơi không fork
+    os.register_at_fork(after_in_child=_reset_nonce_state)
+
+# Các route không có path parameter: URL và phần đầu chuỗi ký được tính sẵn theo client
+_STATIC_PATHS = (
+    "/accounts",
+    "/accounts/orders",
+    "/registration/trading-token",
+    "/registration/send-email-otp",
+    "/price/ohlc",
+    "/instruments",
+    "/market/working-dates",
+    "/market/trading-session",
+    "/brokers/accounts/care-by",
+)
+
+_SIG_CACHE_MAXSIZE = 64
+
+# Các ký tự mà urlencode (quote_plus) giữ nguyên, không cần escape
+_QS_SAFE = re.compile(r"[A-Za-z0-9_.~-]+")
+
+
+def _fast_qs(query):
+    parts = []
+    for key, value in query.items():
+        key = str(key)
+        value = str(value)
+        if not (_QS_SAFE.fullmatch(key) and _QS_SAFE.fullmatch(value)):
+            return parse.urlencode(query)
+        parts.append(f"{key}={value}")
+    return "&".join(parts)
 
 
 class DNSEClient:
@@ -17,16 +74,53 @@ class DNSEClient:
             algorithm="hmac-sha256",
             hmac_nonce_enabled=True,
             api_version=None,
+            parse_json=False,
     ):
         self._api_key = api_key
         self._api_secret = api_secret
+        self._api_secret_bytes = api_secret.encode("utf-8")
         self._base_url = base_url.rstrip("/")
         self._algorithm = algorithm
+        # MAC đã nạp key, mỗi request chỉ copy() thay vì tra cache theo (secret, algorithm)
+        self._mac_proto = hmac_prototype(self._api_secret_bytes, algorithm)
         self._hmac_nonce_enabled = hmac_nonce_enabled
         self._api_version = api_version or get_api_version()
+        # parse_json=True: trả về body đã parse thẳng từ bytes thay vì chuỗi đã decode
+        self._parse_json = parse_json
+        self._debug = os.getenv("DEBUG", "").lower() == "true"
+
+        # Header cố định của mọi request, merge sẵn 1 lần
+        self._static_headers = {"x-api-key": self._api_key, "version": self._api_version}
+        self._json_headers = dict(self._static_headers, **{"Content-Type": "application/json"})
+
+        # Date header có độ phân giải 1 giây nên cache lại chuỗi đã format trong cùng giây
+        self._last_date_sec = None
+        self._last_date_str = None
+
+        # Các phần cố định của chuỗi ký, tính 1 lần cho mỗi client
+        self._date_header_name = get_date_header_name()
+        self._header_key_bytes = self._date_header_name.lower().encode("utf-8")
+        self._headers_list = f"(request-target) {self._date_header_name.lower()}"
+        # Phần đầu cố định của header X-Signature (keyId, algorithm, headers đều không đổi theo client)
+        self._sig_header_prefix = (
+            f'Signature keyId="{self._api_key}",algorithm="{self._algorithm}",'
+            f'headers="{self._headers_list}",signature="'
+        )
+        self._method_prefix = {
+            m: f"(request-target): {m.lower()} ".encode("utf-8")
+            for m in ("GET", "POST", "PUT", "DELETE")
+        }
+        self._static_urls = {p: f"{self._base_url}{p}" for p in _STATIC_PATHS}
+        # (method, path) -> b"(request-target): <method> <path>\n<date header>: ", chỉ cho route tĩnh
+        self._signing_prefix = {}
+        # (method, path) -> (date, X-Signature), chỉ dùng khi tắt nonce
+        self._sig_cache = {}
+
+        # Tạo HTTP client 1 lần duy nhất, tái sử dụng suốt vòng đời object
+        self._http = self._create_http()
 
-        # Tạo PoolManager 1 lần duy nhất, tái sử dụng suốt vòng đời object
-        self._http = urllib3.PoolManager(
+    def _create_http(self):
+        return urllib3.PoolManager(
             num_pools=10,           # Số lượng connection pools
             maxsize=10,             # Số connections tối đa mỗi pool
             block=False,            # Không block khi pool đầy
@@ -35,6 +129,10 @@ class DNSEClient:
             assert_hostname = False  # Không kiểm tra hostname
         )
 
+    def set_debug(self, enabled):
+        """Bật/tắt in chi tiết request (mặc định lấy từ biến môi trường DEBUG khi khởi tạo client)."""
+        self._debug = bool(enabled)
+
     def get_accounts(self, dry_run=False):
         return self._request("GET", "/accounts", dry_run=dry_run)
 
@@ -347,6 +445,21 @@ class DNSEClient:
             dry_run=dry_run,
         )
 
+    def post_orders_batch(self, market_type, payloads, trading_token, order_category="NORMAL", dry_run=False):
+        """Đặt nhiều lệnh, trả về list cùng thứ tự payloads: mỗi phần tử là kết quả post_order
+        hoặc exception của lệnh đó. Một lệnh lỗi không chặn các lệnh còn lại, nên chỉ gửi lại
+        những lệnh có phần tử là exception (gửi lại cả batch sẽ đặt trùng các lệnh đã khớp)."""
+        # Gửi lần lượt trên cùng connection pool keep-alive
+        results = []
+        for payload in payloads:
+            try:
+                results.append(
+                    self.post_order(market_type, payload, trading_token, order_category=order_category, dry_run=dry_run)
+                )
+            except Exception as e:
+                results.append(e)
+        return results
+
     def put_order(
         self,
         account_no,
@@ -418,31 +531,57 @@ class DNSEClient:
         )
 
     def _request(self, method, path, query=None, body=None, headers=None, dry_run=False):
-        debug = os.getenv("DEBUG", "").lower() == "true"
-        url = self._build_url(path, query)
+        url, req_headers, data = self._prepare_request(method, path, query, body, headers, dry_run)
+
+        if dry_run:
+            return None, None
+
+        try:
+            resp = self._http.request(
+                method,
+                url,
+                body=data,
+                headers=req_headers,
+            )
+            return resp.status, self._read_body(resp.data)
+        except urllib3.exceptions.HTTPError as err:
+            if hasattr(err, 'response') and err.response:
+                return err.response.status, self._read_body(err.response.data)
+            raise
+
+    def _read_body(self, raw):
+        if not self._parse_json:
+            return raw.decode("utf-8") if raw else ""
+        if not raw:
+            return None
+        try:
+            return _loads(raw)
+        except ValueError:
+            # Body không phải JSON (vd. lỗi từ proxy): trả về text như bình thường
+            return raw.decode("utf-8")
+
+    def _prepare_request(self, method, path, query, body, headers, dry_run):
+        """Ký request và trả về (url, headers, body bytes); dùng chung cho client sync và async."""
+        # Route tĩnh đã có URL dựng sẵn; chỉ nối query string khi thực sự có query
+        url = self._static_urls.get(path) or self._base_url + path
+        if query:
+            url = f"{url}?{_fast_qs(query)}"
         date_value, signature_header_value = self._signature_headers(method, path)
-        date_header_name = get_date_header_name()
 
         # Build headers dict
         req_headers = {
-            date_header_name: date_value,
+            self._date_header_name: date_value,
             "X-Signature": signature_header_value,
-            "x-api-key": self._api_key,
-            "version": self._api_version,
         }
-
-        if body is not None:
-            req_headers["Content-Type"] = "application/json"
+        req_headers.update(self._json_headers if body is not None else self._static_headers)
 
         if headers:
             req_headers.update(headers)
 
         # Prepare body data
-        data = None
-        if body is not None:
-            data = json.dumps(body)
+        data = _dumps(body) if body is not None else None
 
-        if debug or dry_run:
+        if self._debug or dry_run:
             prefix = "DRY RUN" if dry_run else "DEBUG"
             print(f"{prefix} url:", url)
             print(f"{prefix} method:", method)
@@ -450,56 +589,43 @@ class DNSEClient:
             print(f"{prefix} headers:", req_headers)
             print(f"{prefix} body:", body)
 
-        if dry_run:
-            return None, None
-
-        try:
-            resp = self._http.request(
-                method,
-                url,
-                body=data,
-                headers=req_headers,
-            )
-            body_text = resp.data.decode("utf-8")
-            return resp.status, body_text
-        except urllib3.exceptions.HTTPError as err:
-            if hasattr(err, 'response') and err.response:
-                body_text = err.response.data.decode("utf-8") if err.response.data else ""
-                return err.response.status, body_text
-            raise
-
-    def _build_url(self, path, query):
-        url = f"{self._base_url}{path}"
-        if query:
-            url = f"{url}?{parse.urlencode(query)}"
-        return url
+        return url, req_headers, data
 
     def _signature_headers(self, method, path):
         date_value = self._date_header()
         nonce = None
         if self._hmac_nonce_enabled:
-            import uuid
-
-            nonce = uuid.uuid4().hex
-
-        headers_list, signature = build_signature(
-            self._api_secret,
-            method,
-            path,
-            date_value,
-            self._algorithm,
-            nonce=nonce,
-            header_name=get_date_header_name(),
-        )
-        signature_header_value = (
-            f'Signature keyId="{self._api_key}",algorithm="{self._algorithm}",'
-            f'headers="{headers_list}",signature="{signature}"'
-        )
+            nonce = f"{_NONCE_PID:08x}{time.monotonic_ns():016x}{next(_NONCE_COUNTER):x}"
+
+        signing_prefix = self._signing_prefix.get((method, path))
+        if signing_prefix is None:
+            method_prefix = self._method_prefix.get(method)
+            if method_prefix is None:
+                method_prefix = f"(request-target): {method.lower()} ".encode("utf-8")
+            signing_prefix = b"".join(
+                [method_prefix, path.encode("utf-8"), b"\n", self._header_key_bytes, b": "]
+            )
+            if path in self._static_urls:
+                self._signing_prefix[(method, path)] = signing_prefix
         if nonce:
-            signature_header_value += f',nonce="{nonce}"'
-        return date_value, signature_header_value
+            message = b"".join([signing_prefix, date_value.encode("utf-8"), b"\nnonce: ", nonce.encode("utf-8")])
+            signature = sign_with_prototype(self._mac_proto, message)
+            return date_value, "".join([self._sig_header_prefix, signature, '",nonce="', nonce, '"'])
+
+        # Không có nonce: chữ ký chỉ phụ thuộc (method, path, date) nên dùng lại trong cùng giây
+        cached = self._sig_cache.get((method, path))
+        if cached is not None and cached[0] == date_value:
+            return cached
+        signature = sign_with_prototype(self._mac_proto, signing_prefix + date_value.encode("utf-8"))
+        result = (date_value, "".join([self._sig_header_prefix, signature, '"']))
+        if len(self._sig_cache) >= _SIG_CACHE_MAXSIZE:
+            self._sig_cache.clear()
+        self._sig_cache[(method, path)] = result
+        return result
 
     def _date_header(self):
-        from datetime import datetime, timezone
-
-        return datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z")
+        sec = int(time.time())
+        if sec != self._last_date_sec:
+            self._last_date_str = time.strftime("%a, %d %b %Y %H:%M:%S +0000", time.gmtime(sec))
+            self._last_date_sec = sec
+        return self._last_date_str
@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
 import base64
-import hashlib
+import functools
 import hmac
-import json
 import os
-from datetime import datetime, timezone
-from urllib import parse, request
-from uuid import uuid4
+
+try:
+    import blake3
+except ImportError:  # blake3 là tuỳ chọn, chỉ cần khi dùng algorithm="hmac-blake3"
+    blake3 = None
 
 DEFAULT_API_VERSION = "2026-05-07"
 
 
+@functools.lru_cache(maxsize=None)
 def get_date_header_name():
     return os.getenv("DATE_HEADER", "Date")
 
@@ -19,6 +21,29 @@ def get_api_version():
     return os.getenv("DNSE_API_VERSION") or DEFAULT_API_VERSION
 
 
+# Truyền tên digest dạng chuỗi để hmac dùng thẳng backend OpenSSL (_hashlib.HMAC)
+_DIGESTMODS = {
+    "hmac-sha256": "sha256",
+    "hmac-sha384": "sha384",
+    "hmac-sha512": "sha512",
+}
+
+
+@functools.lru_cache(maxsize=8)
+def _hmac_proto(secret_bytes, algorithm):
+    # HMAC đã nạp sẵn key, chỉ cần copy() và update() message cho mỗi request
+    if algorithm == "hmac-blake3":
+        if blake3 is None:
+            raise ImportError("algorithm hmac-blake3 cần gói blake3: pip install blake3")
+        # BLAKE3 keyed mode dùng thẳng secret làm key, không tự dẫn xuất key mà server không biết
+        if len(secret_bytes) != 32:
+            raise ValueError(
+                f"algorithm hmac-blake3 cần api_secret dài đúng 32 byte, nhận {len(secret_bytes)} byte"
+            )
+        return blake3.blake3(key=secret_bytes)
+    return hmac.new(secret_bytes, b"", _DIGESTMODS.get(algorithm, "sha1"))
+
+
 def build_signature(secret, method, path, date_value, algorithm, nonce=None, header_name=None):
     header_name = header_name or get_date_header_name()
     header_key = header_name.lower()
@@ -29,83 +54,33 @@ def build_signature(secret, method, path, date_value, algorithm, nonce=None, hea
     if nonce:
         signature_string += f"\nnonce: {nonce}"
 
-    if algorithm == "hmac-sha256":
-        digestmod = hashlib.sha256
-    elif algorithm == "hmac-sha384":
-        digestmod = hashlib.sha384
-    elif algorithm == "hmac-sha512":
-        digestmod = hashlib.sha512
-    else:
-        digestmod = hashlib.sha1
-
-    mac = hmac.new(secret.encode("utf-8"), signature_string.encode("utf-8"), digestmod)
-    encoded = base64.b64encode(mac.digest()).decode("utf-8")
-    escaped = parse.quote(encoded, safe="")
-
-    return headers, escaped
-
-
-def send_signed_request(
-    url,
-    method,
-    headers,
-    body,
-    api_key,
-    api_secret,
-    algorithm="hmac-sha256",
-    hmac_nonce_enabled=True,
-):
-    debug = os.getenv("DEBUG", "").lower() == "true"
-    headers = dict(headers or {})
-    headers.setdefault("version", get_api_version())
-    parsed = parse.urlparse(url)
-    path = parsed.path
-    date_value = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S %z")
-    date_header_name = get_date_header_name()
-
-    nonce = uuid4().hex if hmac_nonce_enabled else None
-    headers_list, signature = build_signature(
-        api_secret,
-        method,
-        path,
-        date_value,
-        algorithm,
-        nonce=nonce,
-        header_name=date_header_name,
-    )
-    signature_header_value = (
-        f'Signature keyId="{api_key}",algorithm="{algorithm}",'
-        f'headers="{headers_list}",signature="{signature}"'
-    )
-    if nonce:
-        signature_header_value += f',nonce="{nonce}"'
-
-    data = None
-    if body is not None:
-        data = json.dumps(body).encode("utf-8")
-        headers.setdefault("Content-Type", "application/json")
-
-    req = request.Request(url, data=data, method=method)
-    req.add_header(date_header_name, date_value)
-    req.add_header("X-Signature", signature_header_value)
-
-    for key, value in headers.items():
-        req.add_header(key, value)
-
-    if debug:
-        query_params = parse.parse_qs(parsed.query)
-        print("DEBUG url:", url)
-        print("DEBUG method:", method)
-        print("DEBUG query_params:", query_params)
-        print("DEBUG headers:", dict(req.header_items()))
-        print("DEBUG body:", body)
-
-    try:
-        with request.urlopen(req) as resp:
-            body_text = resp.read().decode("utf-8")
-            print(body_text)
-    except request.HTTPError as err:
-        body_text = err.read().decode("utf-8") if err.fp else ""
-        print(f"HTTP {err.code} {err.reason}")
-        if body_text:
-            print(body_text)
+    if isinstance(secret, str):
+        secret = secret.encode("utf-8")
+    return headers, sign_message(secret, signature_string.encode("utf-8"), algorithm)
+
+
+def sign_message(secret_bytes, message, algorithm):
+    """Ký chuỗi signing đã encode sẵn (bytes), trả về chữ ký base64 đã URL-escape."""
+    return sign_with_prototype(_hmac_proto(secret_bytes, algorithm), message)
+
+
+def hmac_prototype(secret_bytes, algorithm):
+    """Trả về đối tượng MAC đã nạp key, để client giữ lại và ký bằng sign_with_prototype."""
+    return _hmac_proto(secret_bytes, algorithm)
+
+
+def sign_with_prototype(proto, message):
+    mac = proto.copy()
+    mac.update(message)
+    # Base64 chuẩn chỉ có 3 ký tự cần percent-encode: "+", "/", "="
+    encoded = base64.b64encode(mac.digest())
+    return encoded.replace(b"+", b"%2B").replace(b"/", b"%2F").replace(b"=", b"%3D").decode("ascii")
+
+
+def __getattr__(name):
+    # send_signed_request nằm ở _signed_transport, chỉ import khi thực sự cần
+    if name == "send_signed_request":
+        from ._signed_transport import send_signed_request
+
+        return send_signed_request
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,7 +12,10 @@ This module provides the main TradingClient class that handles:
 
 import asyncio
 import logging
+import random
 import time
+from collections import deque
+from concurrent.futures import Executor
 from typing import Optional, Callable, List, Dict, Any
 
 from .auth import AuthManager
@@ -25,7 +28,7 @@ from .exceptions import (
     ConnectionClosed,
 )
 from .models import Trade, Quote, Ohlc, Order, AccountUpdate, ExpectedPrice, SecurityDefinition, TradeExtra, \
-    MarketIndex, ForeignInvestor, Position, EstimatedMarketIndex, Session
+    MarketIndex, ForeignInvestor, Position, EstimatedMarketIndex, Session, TopOfBook
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -36,7 +39,18 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+# Outbound frames written per writer wake-up before yielding back to the loop
+_MAX_SEND_BURST = 64
+# Market-data messages buffered per async handler before the oldest are dropped
+_ASYNC_HANDLER_QUEUE_SIZE = 1024
+# Minimum seconds between "handler falling behind" warnings per handler
+_DROP_LOG_INTERVAL = 5.0
+
+# Compact JSON auth acks recognised without a full parse (anything else is decoded)
+_AUTH_SUCCESS_PREFIXES = (b'{"action":"auth_success"', b'{"a":"auth_success"')
+
 DEFAULT_BOARDS = ["G1", "G3", "G4", "G7", "T1", "T2", "T3", "T4", "T6"]
+OHLC_RESOLUTIONS = ["1", "3", "5", "15", "30", "1H", "1D", "1W"]
 
 _MSG_TYPE_MAP = {
     "t": ("trade", Trade, None),
@@ -57,6 +71,18 @@ _MSG_TYPE_MAP = {
     "s": ("session", Session, None),
 }
 
+# msg_type -> (event, bound from_dict, payload field), resolved once at import
+_DISPATCH_TABLE = {
+    msg_type: (event, model_cls.from_dict, field)
+    for msg_type, (event, model_cls, field) in _MSG_TYPE_MAP.items()
+}
+
+# Events whose stale messages a lagging async handler may lose; private account events
+# (orders, positions, balances) and lifecycle events are always delivered
+_DROPPABLE_EVENTS = frozenset(
+    {event for event, _, _ in _MSG_TYPE_MAP.values()} - {"order_event", "position_event", "account"}
+) | {"quote_top"}
+
 
 class TradingClient:
     """
@@ -67,7 +93,7 @@ class TradingClient:
     - HMAC-SHA256 authentication
     - Support for JSON and MessagePack encoding
     - Event-driven architecture with callback handlers
-    - Heartbeat monitoring with pong tracking
+    - Heartbeat monitoring (idle ping, last-activity health check)
     - Context manager support (async with)
     - Async iterator support (async for)
     """
@@ -82,6 +108,10 @@ class TradingClient:
             max_retries: int = 10,
             heartbeat_interval: float = 25.0,
             timeout: float = 60.0,
+            transport: str = "websockets",
+            socket_buffer_size: Optional[int] = None,
+            max_queue: int = 1024,
+            jitter: bool = True,
     ):
         """
         Initialize trading client.
@@ -95,15 +125,28 @@ class TradingClient:
             max_retries: Maximum reconnection attempts
             heartbeat_interval: Seconds between heartbeat pings
             timeout: Connection timeout in seconds
+            transport: WebSocket transport ("websockets" or "picows", requires the picows package)
+            socket_buffer_size: Kernel socket buffer size in bytes; None (default) keeps OS autotuning
+            max_queue: Received messages buffered before reading from the socket pauses; the
+                websockets transport holds up to max_queue more in its own queue (about 2x in total)
+            jitter: Randomize reconnect backoff delays so clients don't reconnect in lockstep
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url
         self.encoding = encoding
+        # Channel suffix follows the client's encoding so channels match what the decoder parses
+        self._default_channel_ext = "msgpack" if encoding == "msgpack" else "json"
         self.auto_reconnect = auto_reconnect
         self.max_retries = max_retries
         self.heartbeat_interval = heartbeat_interval
         self.timeout = timeout
+        if transport not in ("websockets", "picows"):
+            raise ValueError(f"Invalid transport: {transport}. Must be 'websockets' or 'picows'")
+        self.transport = transport
+        self.socket_buffer_size = socket_buffer_size
+        self.max_queue = max_queue
+        self.jitter = jitter
 
         # Internal state
         self._connection: Optional[WebSocketConnection] = None
@@ -111,18 +154,31 @@ class TradingClient:
         self._encoder = MessageEncoder(encoding)
         self._decoder = MessageDecoder(encoding)
         self._event_handlers: Dict[str, List[Callable]] = {}
+        # Async handlers: one buffer + worker task each (see _make_async_handler)
+        self._async_handlers: List[Dict[str, Any]] = []
+        # channel -> {"symbols": set of symbols, "kwargs": dict}, replayed on reconnect
         self._subscriptions: Dict[str, Dict[str, Any]] = {}
         self._is_authenticated = False
         self._session_id: Optional[str] = None
         # Per-event queues: only created when needed (async iterator usage)
         self._queues: Dict[str, asyncio.Queue] = {}
+        # Shared stream for `async for` (single consumer): deque + wake-up future, created by __aiter__
+        self._iter_messages: Optional[deque] = None
+        self._iter_waiter: Optional[asyncio.Future] = None
+        # _DISPATCH_TABLE narrowed to consumed events; rebuilt by _refresh_dispatch
+        self._active_dispatch: Dict[str, tuple] = {}
         # Internal dispatch queues: 1 queue per worker, symbol hashed to worker
         self._dispatch_queues: List[asyncio.Queue] = []
         self._is_running = False
-        self._last_pong_time: float = 0.0
+        # time.monotonic() stamp of the last frame of any kind received (pongs included)
+        self._last_activity: float = 0.0
         self._heartbeat_task: Optional[asyncio.Task] = None
         self._message_handler_task: Optional[asyncio.Task] = None
         self._dispatch_worker_tasks: List[asyncio.Task] = []
+        # Outbound frames drained by a single writer task (see _queue_send)
+        self._pending_sends: deque = deque()
+        self._send_event: Optional[asyncio.Event] = None
+        self._send_task: Optional[asyncio.Task] = None
         self._num_workers: int = 6  # 1 worker per symbol slot
 
     async def connect(self) -> None:
@@ -138,12 +194,23 @@ class TradingClient:
 
         logger.info(f"Connecting to {url}")
 
-        self._connection = WebSocketConnection(
+        if self.transport == "picows":
+            from .picows_connection import PicowsConnection
+
+            connection_cls = PicowsConnection
+        else:
+            connection_cls = WebSocketConnection
+
+        self._connection = connection_cls(
             url=url,
             timeout=self.timeout,
             heartbeat_interval=self.heartbeat_interval,
             auto_reconnect=self.auto_reconnect,
             max_retries=self.max_retries,
+            encoding=self.encoding,
+            socket_buffer_size=self.socket_buffer_size,
+            max_queue=self.max_queue,
+            jitter=self.jitter,
         )
 
         await self._connection.connect()
@@ -163,7 +230,7 @@ class TradingClient:
 
         # Start background tasks
         self._is_running = True
-        self._last_pong_time = time.time()
+        self._last_activity = time.monotonic()
 
         # Init 1 queue per worker slot
         self._dispatch_queues = [asyncio.Queue() for _ in range(self._num_workers)]
@@ -174,6 +241,15 @@ class TradingClient:
             for i in range(self._num_workers)
         ]
 
+        # Start one worker per async handler registered before connect
+        for slot in self._async_handlers:
+            if slot["task"] is None:
+                self._start_async_handler(slot)
+
+        # Start writer (subscribe/unsubscribe/ping frames queued by _queue_send)
+        self._send_event = asyncio.Event()
+        self._send_task = asyncio.create_task(self._send_loop())
+
         # Start message handler (receive + decode only)
         self._message_handler_task = asyncio.create_task(self._message_handler())
 
@@ -199,6 +275,11 @@ class TradingClient:
             self._connection.receive(), timeout=self.timeout
         )
 
+        if self.encoding == "json" and response.startswith(_AUTH_SUCCESS_PREFIXES):
+            self._is_authenticated = True
+            logger.info("Authentication successful")
+            return
+
         data = self._decoder.decode(response)
         action = data.get("action") or data.get("a")
 
@@ -211,32 +292,41 @@ class TradingClient:
         else:
             raise AuthenticationError(f"Unexpected response: {action}")
 
+    def _channel_ext(self, encoding: Optional[str]) -> str:
+        """Channel suffix for the client's encoding; a per-call encoding must match it."""
+        if encoding is not None and ("msgpack" if encoding == "msgpack" else "json") != self._default_channel_ext:
+            # Frames in another encoding would fail in the decoder and stop the message loop
+            raise ValueError(
+                f"encoding={encoding!r} does not match the client's encoding {self.encoding!r}; "
+                f"create a TradingClient with encoding={encoding!r} instead"
+            )
+        return self._default_channel_ext
+
     async def subscribe_trades(
-            self, symbols: List[str], on_trade: Optional[Callable[[Trade], None]] = None, encoding="json", board_id=None
+            self, symbols: List[str], on_trade: Optional[Callable[[Trade], None]] = None, encoding=None, board_id=None,
+            executor: Optional[Executor] = None
     ) -> None:
         boards = [board_id] if board_id is not None else DEFAULT_BOARDS
 
-        for board in boards:
-            channel = f"tick.{board}.json"
-            if encoding == "msgpack":
-                channel = f"tick.{board}.msgpack"
-            await self._subscribe_channel(channel, symbols)
+        ext = self._channel_ext(encoding)
+        channels = [f"tick.{board}.{ext}" for board in boards]
+        await self._subscribe_channels(channels, symbols)
 
         if on_trade:
+            if executor is not None:
+                on_trade = self._make_executor_handler("trade", executor, on_trade)
             _handler = self._make_filtered_handler(board_id, "boardId", on_trade) if board_id is not None else on_trade
             self.on("trade", _handler)
 
     async def subscribe_trade_extra(
-            self, symbols: List[str], on_trade_extra: Optional[Callable[[TradeExtra], None]] = None, encoding="json",
+            self, symbols: List[str], on_trade_extra: Optional[Callable[[TradeExtra], None]] = None, encoding=None,
             board_id=None
     ) -> None:
         boards = [board_id] if board_id is not None else DEFAULT_BOARDS
 
-        for board in boards:
-            channel = f"tick_extra.{board}.json"
-            if encoding == "msgpack":
-                channel = f"tick_extra.{board}.msgpack"
-            await self._subscribe_channel(channel, symbols)
+        ext = self._channel_ext(encoding)
+        channels = [f"tick_extra.{board}.{ext}" for board in boards]
+        await self._subscribe_channels(channels, symbols)
 
         if on_trade_extra:
             _handler = self._make_filtered_handler(board_id, "boardId",
@@ -245,15 +335,13 @@ class TradingClient:
 
     async def subscribe_expected_price(
             self, symbols: List[str], on_expected_price: Optional[Callable[[ExpectedPrice], None]] = None,
-            encoding="json", board_id=None
+            encoding=None, board_id=None
     ) -> None:
         boards = [board_id] if board_id is not None else DEFAULT_BOARDS
 
-        for board in boards:
-            channel = f"expected_price.{board}.json"
-            if encoding == "msgpack":
-                channel = f"expected_price.{board}.msgpack"
-            await self._subscribe_channel(channel, symbols)
+        ext = self._channel_ext(encoding)
+        channels = [f"expected_price.{board}.{ext}" for board in boards]
+        await self._subscribe_channels(channels, symbols)
 
         if on_expected_price:
             _handler = self._make_filtered_handler(board_id, "boardId",
@@ -263,9 +351,9 @@ class TradingClient:
     async def subscribe_order_event(
             self, market_type="STOCK",
             on_order_event: Optional[Callable[[Order], None]] = None,
-            encoding="json"
+            encoding=None
     ) -> None:
-        channel = f"order.{market_type}.{encoding}"
+        channel = f"order.{market_type}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_order_event:
@@ -276,9 +364,9 @@ class TradingClient:
             investor_id: str,
             market_type="STOCK",
             on_order_event: Optional[Callable[[Order], None]] = None,
-            encoding="json"
+            encoding=None
     ) -> None:
-        channel = f"order.broker.{market_type}.{investor_id}.{encoding}"
+        channel = f"order.broker.{market_type}.{investor_id}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_order_event:
@@ -287,9 +375,9 @@ class TradingClient:
     async def subscribe_position_event(
             self, market_type="STOCK",
             on_position_event: Optional[Callable[[Position], None]] = None,
-            encoding="json"
+            encoding=None
     ) -> None:
-        channel = f"position.{market_type}.{encoding}"
+        channel = f"position.{market_type}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_position_event:
@@ -300,9 +388,9 @@ class TradingClient:
             investor_id: str,
             market_type="STOCK",
             on_position_event: Optional[Callable[[Position], None]] = None,
-            encoding="json"
+            encoding=None
     ) -> None:
-        channel = f"position.broker.{market_type}.{investor_id}.{encoding}"
+        channel = f"position.broker.{market_type}.{investor_id}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_position_event:
@@ -310,15 +398,13 @@ class TradingClient:
 
     async def subscribe_sec_def(
             self, symbols: List[str], on_sec_def: Optional[Callable[[SecurityDefinition], None]] = None,
-            encoding="json", board_id=None
+            encoding=None, board_id=None
     ) -> None:
         boards = [board_id] if board_id is not None else DEFAULT_BOARDS
 
-        for board in boards:
-            channel = f"security_definition.{board}.json"
-            if encoding == "msgpack":
-                channel = f"security_definition.{board}.msgpack"
-            await self._subscribe_channel(channel, symbols)
+        ext = self._channel_ext(encoding)
+        channels = [f"security_definition.{board}.{ext}" for board in boards]
+        await self._subscribe_channels(channels, symbols)
 
         if on_sec_def:
             _handler = self._make_filtered_handler(board_id, "boardId",
@@ -326,11 +412,9 @@ class TradingClient:
             self.on("security_definition", _handler)
 
     async def subscribe_market_index(
-            self, market_index: str, on_market_index: Optional[Callable[[MarketIndex], None]] = None, encoding="json"
+            self, market_index: str, on_market_index: Optional[Callable[[MarketIndex], None]] = None, encoding=None
     ) -> None:
-        channel = f"market_index.{market_index}.json"
-        if encoding == "msgpack":
-            channel = f"market_index.{market_index}.msgpack"
+        channel = f"market_index.{market_index}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_market_index:
@@ -338,38 +422,40 @@ class TradingClient:
 
     async def subscribe_estimated_market_index(
             self, estimated_market_index: str,
-            on_estimated_market_index: Optional[Callable[[EstimatedMarketIndex], None]] = None, encoding="json"
+            on_estimated_market_index: Optional[Callable[[EstimatedMarketIndex], None]] = None, encoding=None
     ) -> None:
-        channel = f"estimated_market_index.{estimated_market_index}.json"
-        if encoding == "msgpack":
-            channel = f"estimated_market_index.{estimated_market_index}.msgpack"
+        channel = f"estimated_market_index.{estimated_market_index}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_estimated_market_index:
             self.on("estimated_market_index", on_estimated_market_index)
 
     async def subscribe_quotes(
-            self, symbols: List[str], on_quote: Optional[Callable[[Quote], None]] = None, encoding="json", board_id=None
+            self, symbols: List[str], on_quote: Optional[Callable[[Quote], None]] = None, encoding=None, board_id=None,
+            top_only: bool = False
     ) -> None:
+        """
+        Subscribe to order-book quotes.
+
+        With top_only=True, on_quote receives a TopOfBook (level 0 of each side, event
+        "quote_top") and the full book is not built unless another consumer needs it.
+        """
         boards = [board_id] if board_id is not None else ["G1", "G2", "G3", "G4", "G5", "G6", "G7"]
 
-        for board in boards:
-            channel = f"top_price.{board}.json"
-            if encoding == "msgpack":
-                channel = f"top_price.{board}.msgpack"
-            await self._subscribe_channel(channel, symbols)
+        ext = self._channel_ext(encoding)
+        channels = [f"top_price.{board}.{ext}" for board in boards]
+        await self._subscribe_channels(channels, symbols)
 
         if on_quote:
             _handler = self._make_filtered_handler(board_id, "boardId", on_quote) if board_id is not None else on_quote
-            self.on("quote", _handler)
+            self.on("quote_top" if top_only else "quote", _handler)
 
     async def subscribe_foreign_trading(
             self, symbols: List[str], board_id: str = "*",
             on_trade: Optional[Callable[[ForeignInvestor], None]] = None,
-            encoding="json"
+            encoding=None
     ) -> None:
-        ext = "msgpack" if encoding == "msgpack" else "json"
-        channel = f"foreign.{board_id}.{ext}"
+        channel = f"foreign.{board_id}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, symbols)
 
         if on_trade:
@@ -379,35 +465,30 @@ class TradingClient:
             self,
             symbols: List[str],
             resolution: Optional[str] = None,
-            on_ohlc: Optional[Callable[[Ohlc], None]] = None, encoding="json"
+            on_ohlc: Optional[Callable[[Ohlc], None]] = None, encoding=None,
+            executor: Optional[Executor] = None
     ) -> None:
+        ext = self._channel_ext(encoding)
         # If resolution is None, subscribe to all resolutions
         if resolution is None:
-            all_resolutions = ["1", "3", "5", "15", "30", "1H", "1D", "1W"]
-            for res in all_resolutions:
-                channel = "ohlc." + res + ".json"
-                if encoding == "msgpack":
-                    channel = "ohlc." + res + ".msgpack"
-                await self._subscribe_channel(channel, symbols)
+            channels = [f"ohlc.{res}.{ext}" for res in OHLC_RESOLUTIONS]
+            await self._subscribe_channels(channels, symbols)
         else:
-            channel = "ohlc." + resolution + ".json"
-            if encoding == "msgpack":
-                channel = "ohlc." + resolution + ".msgpack"
+            channel = f"ohlc.{resolution}.{ext}"
             await self._subscribe_channel(channel, symbols)
 
         if on_ohlc:
+            if executor is not None:
+                on_ohlc = self._make_executor_handler("ohlc", executor, on_ohlc)
             self.on("ohlc", on_ohlc)
 
     async def subscribe_session(
             self,
             product_group_id: str,
             board_id: str = "*",
-            on_session: Optional[Callable[[Session], None]] = None, encoding="json"
+            on_session: Optional[Callable[[Session], None]] = None, encoding=None
     ) -> None:
-        channel = f"session.{product_group_id}.{board_id}.json"
-
-        if encoding == "msgpack":
-            channel = f"session.{product_group_id}.{board_id}.msgpack"
+        channel = f"session.{product_group_id}.{board_id}.{self._channel_ext(encoding)}"
         await self._subscribe_channel(channel, [])
 
         if on_session:
@@ -417,20 +498,15 @@ class TradingClient:
             self,
             symbols: List[str],
             resolution: Optional[str] = None,
-            on_ohlc: Optional[Callable[[Ohlc], None]] = None, encoding="json"
+            on_ohlc: Optional[Callable[[Ohlc], None]] = None, encoding=None
     ) -> None:
+        ext = self._channel_ext(encoding)
         # If resolution is None, subscribe to all resolutions
         if resolution is None:
-            all_resolutions = ["1", "3", "5", "15", "30", "1H", "1D", "1W"]
-            for res in all_resolutions:
-                channel = "ohlc_closed." + res + ".json"
-                if encoding == "msgpack":
-                    channel = "ohlc_closed." + res + ".msgpack"
-                await self._subscribe_channel(channel, symbols)
+            channels = [f"ohlc_closed.{res}.{ext}" for res in OHLC_RESOLUTIONS]
+            await self._subscribe_channels(channels, symbols)
         else:
-            channel = "ohlc_closed." + resolution + ".json"
-            if encoding == "msgpack":
-                channel = "ohlc_closed." + resolution + ".msgpack"
+            channel = f"ohlc_closed.{resolution}.{ext}"
             await self._subscribe_channel(channel, symbols)
 
         if on_ohlc:
@@ -464,21 +540,33 @@ class TradingClient:
     async def _subscribe_channel(
             self, channel: str, symbols: List[str], **kwargs
     ) -> None:
+        await self._subscribe_channels([channel], symbols, **kwargs)
+
+    async def _subscribe_channels(
+            self, channels: List[str], symbols: List[str], **kwargs
+    ) -> None:
+        """Subscribe several channels with the same symbols in a single frame."""
         if not self._is_authenticated:
             raise SubscriptionError("Must authenticate before subscribing")
 
         subscribe_msg = {
             "action": "subscribe",
-            "channels": [{"name": channel, "symbols": symbols, **kwargs}],
+            "channels": [{"name": channel, "symbols": symbols, **kwargs} for channel in channels],
         }
-
         encoded = self._encoder.encode(subscribe_msg)
-        await self._connection.send(encoded)
 
-        # Store subscription for reconnection
-        self._subscriptions[channel] = {"symbols": symbols, "kwargs": kwargs}
+        await self._queue_send(encoded, wait=True)
+
+        # Store subscription for reconnection (symbols accumulate across calls, as on the server)
+        for channel in channels:
+            sub = self._subscriptions.get(channel)
+            if sub is None:
+                self._subscriptions[channel] = {"symbols": set(symbols), "kwargs": kwargs}
+            else:
+                sub["symbols"].update(symbols)
+                sub["kwargs"] = kwargs
 
-        logger.info(f"Subscribed to {channel}: {symbols}")
+        logger.info(f"Subscribed to {', '.join(channels)}: {symbols}")
 
     async def unsubscribe(self, channel: str, symbols: List[str]) -> None:
         unsubscribe_msg = {
@@ -487,14 +575,12 @@ class TradingClient:
         }
 
         encoded = self._encoder.encode(unsubscribe_msg)
-        await self._connection.send(encoded)
+        await self._queue_send(encoded, wait=True)
 
         # Update local state
         if channel in self._subscriptions:
-            stored_symbols = self._subscriptions[channel].get("symbols", [])
-            for symbol in symbols:
-                if symbol in stored_symbols:
-                    stored_symbols.remove(symbol)
+            stored_symbols = self._subscriptions[channel]["symbols"]
+            stored_symbols.difference_update(symbols)
 
             # Remove channel if no symbols left
             if not stored_symbols:
@@ -502,6 +588,52 @@ class TradingClient:
 
         logger.info(f"Unsubscribed from {channel}: {symbols}")
 
+    def _queue_send(self, message: bytes, wait: bool = False) -> Optional[asyncio.Future]:
+        """
+        Queue an encoded frame for the writer task.
+
+        Frames queued in the same loop iteration (e.g. back-to-back subscribe_*
+        calls at startup) are written in one burst without suspending between them.
+
+        Args:
+            message: Encoded frame
+            wait: Return a future resolved once this frame is written (or failed
+                with the send error); without it the frame is fire-and-forget (pings, pongs)
+
+        Raises:
+            ConnectionError: Client is not connected
+        """
+        if self._send_task is None or self._send_task.done():
+            raise ConnectionError("Not connected")
+        fut = asyncio.get_running_loop().create_future() if wait else None
+        self._pending_sends.append((message, fut))
+        self._send_event.set()
+        return fut
+
+    async def _send_loop(self) -> None:
+        pending = self._pending_sends
+        wakeup = self._send_event
+        while self._is_running:
+            await wakeup.wait()
+            wakeup.clear()
+            while pending:
+                # Cap the burst so a large backlog can't starve the receive loop
+                for _ in range(min(len(pending), _MAX_SEND_BURST)):
+                    message, fut = pending.popleft()
+                    try:
+                        await self._connection.send(message)
+                    except Exception as e:
+                        if fut is None:
+                            logger.error(f"Send error: {e}")
+                            self._emit("error", e)
+                        elif not fut.done():
+                            fut.set_exception(e)
+                    else:
+                        if fut is not None and not fut.done():
+                            fut.set_result(None)
+                if pending:
+                    await asyncio.sleep(0)
+
     def _make_filtered_handler(self, board_id: Optional[str], attr: str, handler: Callable) -> Callable:
         """Wrap handler to only fire when obj.{attr} == board_id."""
 
@@ -511,25 +643,141 @@ class TradingClient:
 
         return _filtered
 
+    def _make_executor_handler(self, event: str, executor: Executor, handler: Callable) -> Callable:
+        """Wrap handler to run in executor so slow callbacks don't block the receive loop."""
+
+        def _log_error(fut, _e=event):
+            exc = fut.exception()
+            if exc is not None:
+                logger.error(f"Handler error for {_e}: {exc}")
+
+        def _submit(obj, _ex=executor, _cb=handler):
+            asyncio.get_running_loop().run_in_executor(_ex, _cb, obj).add_done_callback(_log_error)
+
+        return _submit
+
+    def _make_async_handler(self, event: str, handler: Callable) -> Callable:
+        """
+        Wrap an async handler so _emit enqueues instead of creating a task per message.
+
+        Messages are buffered even while no worker runs (before connect, after disconnect)
+        and drained in order once it starts. Only market-data events are bounded: when a
+        handler falls behind, the oldest buffered ticks are dropped, counted, and reported
+        at most once per _DROP_LOG_INTERVAL.
+        """
+        slot: Dict[str, Any] = {
+            "event": event, "handler": handler, "buffer": deque(), "waiter": None, "task": None,
+            "dropped": 0, "reported": 0, "last_report": 0.0,
+        }
+        self._async_handlers.append(slot)
+        if self._is_running:
+            self._start_async_handler(slot)
+
+        bounded = event in _DROPPABLE_EVENTS
+
+        def _enqueue(obj, _slot=slot, _buf=slot["buffer"], _bounded=bounded):
+            if _bounded and len(_buf) >= _ASYNC_HANDLER_QUEUE_SIZE:
+                _buf.popleft()
+                self._count_drop(_slot)
+            _buf.append(obj)
+            waiter = _slot["waiter"]
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
+
+        return _enqueue
+
+    def _count_drop(self, slot: Dict[str, Any]) -> None:
+        slot["dropped"] += 1
+        now = time.monotonic()
+        if now - slot["last_report"] >= _DROP_LOG_INTERVAL:
+            logger.warning(
+                f"Async handler for {slot['event']} is falling behind: dropped "
+                f"{slot['dropped'] - slot['reported']} stale messages ({slot['dropped']} total)"
+            )
+            slot["reported"] = slot["dropped"]
+            slot["last_report"] = now
+
+    def _start_async_handler(self, slot: Dict[str, Any]) -> None:
+        slot["task"] = asyncio.create_task(self._async_handler_worker(slot))
+
+    async def _async_handler_worker(self, slot: Dict[str, Any]) -> None:
+        """Run one async handler sequentially over its buffer (same order as emitted)."""
+        event = slot["event"]
+        handler = slot["handler"]
+        buf = slot["buffer"]
+        loop = asyncio.get_running_loop()
+        while True:
+            while buf:
+                data = buf.popleft()
+                try:
+                    await handler(data)
+                except Exception as e:
+                    logger.error(f"Handler error for {event}: {e}")
+            waiter = slot["waiter"] = loop.create_future()
+            try:
+                await waiter
+            finally:
+                slot["waiter"] = None
+
     def on(self, event: str, handler: Callable) -> None:
+        if asyncio.iscoroutinefunction(handler):
+            handler = self._make_async_handler(event, handler)
         if event not in self._event_handlers:
             self._event_handlers[event] = []
         self._event_handlers[event].append(handler)
+        self._refresh_dispatch()
+
+    def _refresh_dispatch(self) -> None:
+        """Narrow the dispatch table to events with a handler, queue or iterator attached."""
+        consumed = self._event_handlers.keys() | self._queues.keys()
+        if "*" in self._queues or self._iter_messages is not None:
+            active = dict(_DISPATCH_TABLE)
+        else:
+            active = {
+                msg_type: entry for msg_type, entry in _DISPATCH_TABLE.items() if entry[0] in consumed
+            }
+        if "quote_top" in consumed:
+            if "q" in active:
+                # Full book is built anyway: derive the top of book from it
+                active["q"] = ("quote", self._quote_with_top, None)
+            else:
+                active["q"] = ("quote_top", Quote.parse_top_of_book, None)
+        self._active_dispatch = active
+
+    def _quote_with_top(self, data: Dict[str, Any]) -> Quote:
+        """Quote parser used when both "quote" and "quote_top" have consumers."""
+        quote = Quote.from_dict(data)
+        top = TopOfBook.from_quote(quote)
+        self._emit("quote_top", top)
+        if "quote_top" not in self._event_handlers and "quote_top" in self._queues:
+            self._queues["quote_top"].put_nowait(top)
+        return quote
 
     async def _message_handler(self) -> None:
         reconnect_attempt = 0
         max_reconnect_delay = 60
 
         while self._is_running:
+            # Hot-loop lookups bound once per (re)connection
+            # Unwrapped decode: failures reach the broad handler below without an EncodingError rewrap
+            decode = self._decoder.decode_raw
+            # Dispatch queues are unbounded: put_nowait never blocks, no await per message
+            puts = [q.put_nowait for q in self._dispatch_queues]
+            num_workers = self._num_workers
+            now = time.time
+            monotonic = time.monotonic
             try:
-                async for message in self._connection:
-                    data = self._decoder.decode(message)
-                    data["_receivedAt"] = time.time()
-
-                    # Hash symbol → worker index để đảm bảo cùng 1 mã
-                    symbol = data.get("Symbol") or data.get("symbol") or ""
-                    worker_idx = hash(symbol) % self._num_workers
-                    await self._dispatch_queues[worker_idx].put(data)
+                # One await drains every message already buffered
+                async for batch in self._connection.iter_batches():
+                    received_at = now()
+                    self._last_activity = monotonic()
+                    for message in batch:
+                        data = decode(message)
+                        data["_receivedAt"] = received_at
+
+                        # Hash symbol → worker index để đảm bảo cùng 1 mã
+                        symbol = data.get("Symbol") or data.get("symbol") or ""
+                        puts[hash(symbol) % num_workers](data)
 
                     reconnect_attempt = 0
             except ConnectionClosed as e:
@@ -573,9 +821,12 @@ class TradingClient:
                         self._emit("max_reconnect_exceeded", reconnect_attempt)
                         break
 
+                    # Full jitter so clients dropped together don't reconnect in lockstep
                     delay = min(2 ** (reconnect_attempt - 1), max_reconnect_delay)
+                    if self.jitter:
+                        delay = random.uniform(0, delay)
                     logger.info(
-                        f"Connection error detected. Reconnecting in {delay}s (attempt {reconnect_attempt}/{self.max_retries})...")
+                        f"Connection error detected. Reconnecting in {delay:.1f}s (attempt {reconnect_attempt}/{self.max_retries})...")
 
                     self._emit("reconnecting", {
                         "attempt": reconnect_attempt,
@@ -603,10 +854,15 @@ class TradingClient:
         so same symbol always processed by same worker → message order guaranteed.
         """
         q = self._dispatch_queues[worker_idx]
+        dispatch = self._dispatch_message
         while self._is_running:
             try:
-                data = await asyncio.wait_for(q.get(), timeout=1.0)
-                await self._dispatch_message(data)
+                try:
+                    data = q.get_nowait()
+                except asyncio.QueueEmpty:
+                    # Only idle workers pay for the timeout wrapper
+                    data = await asyncio.wait_for(q.get(), timeout=1.0)
+                await dispatch(data)
                 q.task_done()
             except asyncio.TimeoutError:
                 continue
@@ -662,44 +918,56 @@ class TradingClient:
         return any(keyword in error_msg for keyword in connection_keywords)
 
     async def _dispatch_message(self, data: Dict[str, Any]) -> None:
-        action = data.get("action") or data.get("a")
+        # Data frames dominate the stream: one table lookup, control actions only on a miss.
+        # Key literals are compile-time interned and the native decoders cache map keys,
+        # so these lookups already hit the identity fast path
         msg_type = data.get("T")
+        entry = self._active_dispatch.get(msg_type)
+        if entry is None and msg_type in _DISPATCH_TABLE:
+            # One connection carries every stream: skip types nobody consumes
+            return
+        if entry is not None:
+            event, from_dict, field = entry
+            handlers = self._event_handlers
+            queues = self._queues
+            if field:
+                obj = from_dict(data[field])
+                obj.receivedAt = data["_receivedAt"]
+            else:
+                obj = from_dict(data)
+            self._emit(event, obj)
+            # Only push to queue if no callback registered (using async iterator)
+            if event not in handlers:
+                if event in queues:
+                    queues[event].put_nowait(obj)
+                if "*" in queues:
+                    queues["*"].put_nowait(obj)
+                iter_messages = self._iter_messages
+                if iter_messages is not None:
+                    iter_messages.append(obj)
+                    waiter = self._iter_waiter
+                    if waiter is not None and not waiter.done():
+                        waiter.set_result(None)
+            return
 
+        action = data.get("action") or data.get("a")
         if action == "subscribed":
             logger.debug(f"Subscription confirmed: {data}")
         elif action == "ping":
             logger.info("Received ping from server, sending pong")
-            await self._connection.send(self._encoder.encode({"action": "pong"}))
-        elif action == "pong":
-            self._last_pong_time = time.time()
+            self._queue_send(self._encoder.encode({"action": "pong"}))
         elif action == "error":
             error_msg = data.get("message") or data.get("msg")
             logger.error(f"Server error: {error_msg}")
             self._emit("error", Exception(error_msg))
-        elif msg_type in _MSG_TYPE_MAP:
-            event, model_cls, field = _MSG_TYPE_MAP[msg_type]
-            if field is not None and field != "":
-                obj = model_cls.from_dict(data[field])
-                obj.receivedAt = data["_receivedAt"]
-            else:
-                obj = model_cls.from_dict(data)
-            self._emit(event, obj)
-            # Only push to queue if no callback registered (using async iterator)
-            if event not in self._event_handlers:
-                if event in self._queues:
-                    await self._queues[event].put(obj)
-                if "*" in self._queues:
-                    await self._queues["*"].put(obj)
 
     def _emit(self, event: str, data: Any) -> None:
         if event not in self._event_handlers:
             return
         for handler in self._event_handlers[event]:
             try:
-                if asyncio.iscoroutinefunction(handler):
-                    asyncio.ensure_future(handler(data))
-                else:
-                    handler(data)
+                # Async handlers were wrapped by on(): this only enqueues
+                handler(data)
             except Exception as e:
                 logger.error(f"Handler error for {event}: {e}")
 
@@ -715,15 +983,25 @@ class TradingClient:
         """
         if event not in self._queues:
             self._queues[event] = asyncio.Queue()
+            self._refresh_dispatch()
         return self._queues[event]
 
     async def _heartbeat_loop(self) -> None:
+        # Gateway-level ping (answered by a pong message, tracked by is_healthy);
+        # transport liveness is covered by the connection's WebSocket pings on the same interval
+        # Pings are only sent after an idle interval: live market data already proves liveness
+        ping_msg = self._encoder.encode({"action": "ping"})
+        interval = self.heartbeat_interval
         while self._is_running and self._connection and self._connection.is_connected:
             try:
-                ping_msg = self._encoder.encode({"action": "ping"})
-                await self._connection.send(ping_msg)
-                logger.debug("Sent heartbeat ping")
-                await asyncio.sleep(self.heartbeat_interval)
+                # Wake exactly `interval` after the last frame, so the idle ping is never late
+                idle = time.monotonic() - self._last_activity
+                if idle < interval:
+                    await asyncio.sleep(interval - idle)
+                    continue
+                self._queue_send(ping_msg)
+                logger.debug("Queued heartbeat ping")
+                await asyncio.sleep(interval)
             except Exception as e:
                 logger.error(f"Heartbeat error: {e}")
                 break
@@ -762,15 +1040,18 @@ class TradingClient:
         # Re-authenticate
         await self._authenticate()
 
-        # Re-subscribe to all previous channels
-        for channel, sub_data in previous_subscriptions.items():
-            symbols = sub_data.get("symbols", [])
-            kwargs = sub_data.get("kwargs", {})
-            await self._subscribe_channel(channel, symbols, **kwargs)
-            logger.info(f"Re-subscribed to {channel}: {symbols}")
+        # Re-subscribe to all previous channels in a single frame
+        if previous_subscriptions:
+            channels = [
+                {"name": channel, "symbols": list(sub_data["symbols"]), **sub_data["kwargs"]}
+                for channel, sub_data in previous_subscriptions.items()
+            ]
+            await self._queue_send(self._encoder.encode({"action": "subscribe", "channels": channels}), wait=True)
+            for entry in channels:
+                logger.info(f"Re-subscribed to {entry['name']}: {entry['symbols']}")
 
-        # Update pong time
-        self._last_pong_time = time.time()
+        # Restart the idle clock for the new connection
+        self._last_activity = time.monotonic()
 
         # Emit reconnected event
         self._emit("reconnected", {"session_id": self._session_id})
@@ -784,13 +1065,13 @@ class TradingClient:
         if not self._is_authenticated:
             return False
 
-        # Check if we received a pong recently
+        # Check if we received anything recently (a pong, or data that made the ping unnecessary)
         if self.heartbeat_interval > 0:
-            time_since_pong = time.time() - self._last_pong_time
-            max_pong_delay = self.heartbeat_interval * 2
-            if time_since_pong > max_pong_delay:
+            time_since_activity = time.monotonic() - self._last_activity
+            max_idle = self.heartbeat_interval * 2
+            if time_since_activity > max_idle:
                 logger.warning(
-                    f"No pong received for {time_since_pong:.1f}s (max: {max_pong_delay:.1f}s)"
+                    f"No message received for {time_since_activity:.1f}s (max: {max_idle:.1f}s)"
                 )
                 return False
 
@@ -818,6 +1099,29 @@ class TradingClient:
         self._dispatch_worker_tasks.clear()
 
         # Cancel tasks
+        if self._send_task and not self._send_task.done():
+            self._send_task.cancel()
+            try:
+                await self._send_task
+            except asyncio.CancelledError:
+                pass
+        self._send_task = None
+        # Frames never written: callers awaiting them get an error instead of hanging
+        while self._pending_sends:
+            _, fut = self._pending_sends.popleft()
+            if fut is not None and not fut.done():
+                fut.set_exception(ConnectionError("Disconnected before the frame was sent"))
+
+        for slot in self._async_handlers:
+            task = slot["task"]
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            slot["task"] = None
+
         if self._heartbeat_task and not self._heartbeat_task.done():
             self._heartbeat_task.cancel()
             try:
@@ -849,16 +1153,23 @@ class TradingClient:
         await self.disconnect()
 
     def __aiter__(self):
-        """Allow async iteration over all messages via a shared queue."""
-        # Ensure a general queue exists for mixed iteration
-        self.queue("*")
+        """Allow async iteration over all messages via a shared stream."""
+        if self._iter_messages is None:
+            self._iter_messages = deque()
+            self._refresh_dispatch()
         return self
 
     async def __anext__(self):
-        q = self._queues.get("*")
+        pending = self._iter_messages
         while self._is_running:
+            if pending:
+                return pending.popleft()
+            # Only an empty stream pays for a future; producers resolve it on append
+            waiter = self._iter_waiter = asyncio.get_running_loop().create_future()
             try:
-                return await asyncio.wait_for(q.get(), timeout=1.0)
+                await asyncio.wait_for(waiter, timeout=1.0)
             except asyncio.TimeoutError:
                 continue
+            finally:
+                self._iter_waiter = None
         raise StopAsyncIteration
@@ -1,21 +1,18 @@
 import asyncio
 import logging
+import random
+import socket
 import ssl
-from typing import Optional, AsyncIterator
+from collections import deque
+from typing import Optional, AsyncIterator, Deque, List
 
 import certifi
 import websockets
 from websockets import ClientConnection
 from .exceptions import ConnectionError, ConnectionClosed
 
+# Handlers and levels are left to the application's logging configuration
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-if not logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
 
 class WebSocketConnection:
     """
@@ -27,6 +24,19 @@ class WebSocketConnection:
     - Graceful shutdown
     """
 
+    # Exceptions from one connection attempt that trigger a retry with backoff
+    _connect_errors = (websockets.exceptions.WebSocketException, OSError)
+
+    # Close code -> (log level, description, recoverable when auto_reconnect is on);
+    # any other code is logged as an error and treated as recoverable
+    _CLOSE_CODE_ACTIONS = {
+        1000: (logging.INFO, "normally", False),  # Normal closure
+        1001: (logging.INFO, "normally", False),  # Going away
+        1006: (logging.WARNING, "abnormally", True),  # Abnormal closure
+        1011: (logging.WARNING, "abnormally", True),  # Server error
+        1012: (logging.WARNING, "abnormally", True),  # Service restart
+    }
+
     def __init__(
             self,
             url: str,
@@ -34,6 +44,10 @@ class WebSocketConnection:
             heartbeat_interval: float = 25.0,
             auto_reconnect: bool = True,
             max_retries: int = 10,
+            encoding: str = "json",
+            jitter: bool = True,
+            max_queue: int = 1024,
+            socket_buffer_size: Optional[int] = None,
     ):
         """
         Initialize connection manager.
@@ -41,20 +55,41 @@ class WebSocketConnection:
         Args:
             url: WebSocket URL
             timeout: Connection timeout (seconds)
-            heartbeat_interval: Heartbeat interval (seconds)
+            heartbeat_interval: WebSocket ping interval and pong timeout (seconds); 0 disables pings
             auto_reconnect: Enable automatic reconnection
             max_retries: Maximum reconnection attempts
+            encoding: Message encoding ("json" or "msgpack"); msgpack disables permessage-deflate
+            jitter: Randomize each backoff delay in [0, cap] so clients don't reconnect in lockstep
+            max_queue: Received messages buffered before reading from the socket pauses
+                (TCP backpressure instead of unbounded memory growth). websockets keeps its own
+                queue of the same size behind the reader, so up to about 2x max_queue frames are held
+            socket_buffer_size: SO_RCVBUF/SO_SNDBUF in bytes; None keeps the kernel default.
+                Setting it disables Linux receive-buffer autotuning and is capped at 2x rmem_max/wmem_max
         """
         self.url = url
         self.timeout = timeout
         self.heartbeat_interval = heartbeat_interval
         self.auto_reconnect = auto_reconnect
         self.max_retries = max_retries
+        self.encoding = encoding
+        self.jitter = jitter
+        self.max_queue = max_queue
+        self.socket_buffer_size = socket_buffer_size
 
         self._ws: Optional[ClientConnection] = None
+        self._ssl_context: Optional[ssl.SSLContext] = None
         self._retry_count = 0
         self._is_connected = False
 
+        # Received messages, filled by a reader task (public recv() only) and drained by
+        # receive()/receive_many() without awaiting while anything is buffered
+        self._messages: Deque[bytes] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._close_code: Optional[int] = None
+        self._disconnected = False
+        self._reader_task: Optional[asyncio.Task] = None
+        self._has_space: Optional[asyncio.Event] = None
+
     async def connect(self) -> None:
         """
         Establish WebSocket connection.
@@ -65,34 +100,113 @@ class WebSocketConnection:
         """
         while self._retry_count < self.max_retries:
             try:
-                logger.info(f"Connecting to {self.url} (attempt {self._retry_count + 1}/{self.max_retries})")
-                ssl_context = ssl.create_default_context(cafile=certifi.where())
-                # ssl_context.check_hostname = False
-                # ssl_context.verify_mode = ssl.CERT_NONE
-                self._ws = await asyncio.wait_for(
-                    websockets.connect(self.url,
-                                       ssl=ssl_context,
-                                       ping_interval=30,
-                                       ping_timeout=30,
-                                       close_timeout=10,
-                                       max_queue=512), timeout=self.timeout)
+                logger.info("Connecting to %s (attempt %d/%d)", self.url, self._retry_count + 1, self.max_retries)
+                await asyncio.wait_for(self._open(), timeout=self.timeout)
 
                 self._is_connected = True
                 self._retry_count = 0
                 logger.info("Connected successfully")
                 return
 
-            except (websockets.exceptions.WebSocketException, OSError) as e:
+            except self._connect_errors as e:
                 self._retry_count += 1
 
                 if self._retry_count >= self.max_retries:
                     raise ConnectionError(f"Failed to connect after {self.max_retries} attempts: {e}")
 
-                # Exponential backoff: 1s, 2s, 4s, 8s, ... up to 60s
-                delay = min(2 ** (self._retry_count - 1), 60)
-                logger.warning(f"Connection failed: {e}. Retrying in {delay}s...")
+                # Exponential backoff: 1s, 2s, 4s, 8s, ... up to 60s (full jitter: uniform in [0, cap])
+                cap = min(2 ** (self._retry_count - 1), 60)
+                delay = random.uniform(0, cap) if self.jitter else cap
+                logger.warning("Connection failed: %s. Retrying in %.1fs...", e, delay)
                 await asyncio.sleep(delay)
 
+    def _reset_stream(self) -> None:
+        """Forget messages and close state of the previous socket before (re)opening."""
+        self._messages.clear()
+        self._close_code = None
+        self._disconnected = False
+
+    async def _open(self) -> None:
+        """Open the underlying websocket (one attempt, no retry)."""
+        # Detach the old socket first so its reader's cleanup can't mark the new stream closed
+        self._ws = None
+        await self._stop_reader()
+        self._reset_stream()
+        self._ws = await websockets.connect(self.url,
+                                            ssl=self._get_ssl_context(),
+                                            # msgpack is already compact: skip zlib inflate on every frame
+                                            compression=None if self.encoding == "msgpack" else "deflate",
+                                            ping_interval=self.heartbeat_interval or None,
+                                            ping_timeout=self.heartbeat_interval or None,
+                                            close_timeout=10,
+                                            max_queue=self.max_queue)
+        self._tune_socket(self._ws.transport)
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._reader_task = asyncio.create_task(self._reader(self._ws))
+
+    async def _stop_reader(self) -> None:
+        """Cancel the reader task and wait until it has exited."""
+        task, self._reader_task = self._reader_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            # wait() rather than await: the task's CancelledError is not ours to propagate
+            await asyncio.wait([task])
+
+    async def _reader(self, ws: ClientConnection) -> None:
+        """Move messages from the websocket into _messages until it closes."""
+        try:
+            while True:
+                if len(self._messages) >= self.max_queue:
+                    # Stop calling recv(): websockets' own max_queue then pauses the socket (TCP backpressure)
+                    self._has_space.clear()
+                    await self._has_space.wait()
+                # decode=False: text frames (JSON) come back as bytes too, no decode/re-encode
+                self._push(await ws.recv(decode=False))
+        except websockets.exceptions.ConnectionClosed as e:
+            if ws is self._ws:
+                self._close_code = e.rcvd.code if e.rcvd else 1006
+        finally:
+            if ws is self._ws:
+                self._on_disconnected()
+
+    def _push(self, message: bytes) -> None:
+        self._messages.append(message)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _pop(self) -> bytes:
+        message = self._messages.popleft()
+        if not self._has_space.is_set() and len(self._messages) <= self.max_queue // 4:
+            self._has_space.set()
+        return message
+
+    def _on_disconnected(self) -> None:
+        self._disconnected = True
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _tune_socket(self, transport) -> None:
+        """Apply socket_buffer_size to the underlying TCP socket (TCP_NODELAY is already set by asyncio)."""
+        if self.socket_buffer_size is None or transport is None:
+            return
+        sock = transport.get_extra_info("socket")
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer_size)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer_size)
+        except OSError as e:
+            logger.debug("Socket tuning skipped: %s", e)
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        """SSL context built once (CA bundle load) and reused across reconnect attempts."""
+        if self._ssl_context is None:
+            self._ssl_context = ssl.create_default_context(cafile=certifi.where())
+            # self._ssl_context.check_hostname = False
+            # self._ssl_context.verify_mode = ssl.CERT_NONE
+        return self._ssl_context
+
     async def send(self, message: bytes) -> None:
         if not self._ws or not self._is_connected:
             raise ConnectionError("Not connected")
@@ -103,30 +217,62 @@ class WebSocketConnection:
         if not self._ws or not self._is_connected:
             raise ConnectionError("Not connected")
 
-        try:
-            message = await self._ws.recv()
-            return message if isinstance(message, bytes) else message.encode()
-        except websockets.exceptions.ConnectionClosed as e:
-            self._is_connected = False
-            code = e.rcvd.code if e.rcvd else 1006
-
-            if code in (1000, 1001):  # Normal closure, going away
-                logger.info(f"Connection closed normally: {code}")
-                raise ConnectionClosed(f"Connection closed normally: {code}")
-            elif code in (1006, 1011, 1012):  # Abnormal, server error, restart
-                logger.warning(f"Connection closed abnormally: {code}")
-                if self.auto_reconnect:
-                    raise ConnectionClosed(f"Connection closed abnormally: {code}", recoverable=True)
-                else:
-                    raise ConnectionClosed(f"Connection closed abnormally: {code}")
-            else:
-                logger.error(f"Connection closed with unexpected code: {code}")
-                raise ConnectionClosed(f"Connection closed: {code}", recoverable=True)
+        while not self._messages:
+            if self._disconnected:
+                self._raise_closed_code(self._close_code if self._close_code is not None else 1006)
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._pop()
+
+    async def receive_many(self, max_batch: int = 64) -> List[bytes]:
+        """
+        Receive one or more messages in a single await.
+
+        Waits for the first message, then drains whatever is already buffered
+        (up to max_batch) without suspending again.
+
+        Args:
+            max_batch: Maximum number of messages to return
+
+        Returns:
+            List of raw messages, never empty
+        """
+        batch = [await self.receive()]
+        # Bound once per batch instead of looked up per drained message
+        recv_nowait = self._recv_nowait
+        append = batch.append
+        while len(batch) < max_batch:
+            message = recv_nowait()
+            if message is None:
+                # Nothing buffered; a closure is reported by the next receive()
+                break
+            append(message)
+        return batch
+
+    def _recv_nowait(self) -> Optional[bytes]:
+        """Return the next buffered message, or None if receive() would have to wait."""
+        return self._pop() if self._messages else None
+
+    def _raise_closed_code(self, code: int) -> None:
+        self._is_connected = False
+
+        action = self._CLOSE_CODE_ACTIONS.get(code)
+        if action is None:
+            logger.error("Connection closed with unexpected code: %s", code)
+            raise ConnectionClosed(f"Connection closed: {code}", recoverable=True)
+
+        level, how, recoverable = action
+        logger.log(level, "Connection closed %s: %s", how, code)
+        raise ConnectionClosed(f"Connection closed {how}: {code}", recoverable=recoverable and self.auto_reconnect)
 
     async def close(self) -> None:
         """Close connection gracefully"""
         if self._ws:
             await self._ws.close()
+        await self._stop_reader()
 
         self._is_connected = False
         logger.info("Connection closed")
@@ -149,3 +295,15 @@ class WebSocketConnection:
                 # Re-raise so _message_handler can trigger reconnection
                 raise
             raise StopAsyncIteration
+
+    async def iter_batches(self, max_batch: int = 64) -> AsyncIterator[List[bytes]]:
+        """Iterate over messages in batches (see receive_many)."""
+        receive_many = self.receive_many
+        while True:
+            try:
+                yield await receive_many(max_batch)
+            except ConnectionClosed as e:
+                if e.recoverable:
+                    # Re-raise so _message_handler can trigger reconnection
+                    raise
+                return
@@ -1,8 +1,32 @@
 import json
-from typing import Dict, Any
+from functools import partial
+from typing import Dict, Any, Union
 import msgpack
 from .exceptions import EncodingError
 
+try:
+    import msgspec
+except ImportError:  # msgspec is optional; msgpack is used when it is missing
+    msgspec = None
+
+try:
+    import ormsgpack
+except ImportError:  # ormsgpack is optional; second choice after msgspec
+    ormsgpack = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used when it is missing
+    orjson = None
+
+
+# Compact, unescaped output: no inserted spaces, no per-char ASCII escaping (matches orjson's bytes)
+_json_dumps_str = partial(json.dumps, ensure_ascii=False, separators=(',', ':'))
+
+
+def _json_dumps(data: Dict[str, Any]) -> bytes:
+    return _json_dumps_str(data).encode('utf-8')
+
 
 class MessageEncoder:
     """Encode messages for WebSocket transmission"""
@@ -18,6 +42,17 @@ class MessageEncoder:
             raise ValueError(f"Invalid encoding: {encoding}. Must be 'json' or 'msgpack'")
 
         self.encoding = encoding
+        # Encode function resolved once: encode() is a single call, no per-message branching
+        if encoding == "json":
+            self._encode = orjson.dumps if orjson is not None else _json_dumps
+        else:
+            # Native encoders first; msgpack.Packer is reused instead of building packer state per message
+            if msgspec is not None:
+                self._encode = msgspec.msgpack.Encoder().encode
+            elif ormsgpack is not None:
+                self._encode = ormsgpack.packb
+            else:
+                self._encode = msgpack.Packer().pack
 
     def encode(self, data: Dict[str, Any]) -> bytes:
         """
@@ -33,10 +68,7 @@ class MessageEncoder:
             EncodingError: Encoding failed
         """
         try:
-            if self.encoding == "json":
-                return json.dumps(data).encode('utf-8')
-            else:  # msgpack
-                return msgpack.packb(data)
+            return self._encode(data)
         except Exception as e:
             raise EncodingError(f"Failed to encode message: {e}")
 
@@ -55,13 +87,25 @@ class MessageDecoder:
             raise ValueError(f"Invalid encoding: {encoding}. Must be 'json' or 'msgpack'")
 
         self.encoding = encoding
-
-    def decode(self, data: bytes) -> Dict[str, Any]:
+        # Decode function resolved once; all candidates take bytes directly
+        if encoding == "json":
+            self._decode = orjson.loads if orjson is not None else json.loads
+        elif msgspec is not None:
+            # Reusable C decoder (msgspec) for the per-frame msgpack path
+            self._decode = msgspec.msgpack.Decoder().decode
+        elif ormsgpack is not None:
+            self._decode = ormsgpack.unpackb
+        else:
+            self._decode = partial(msgpack.unpackb, raw=False)
+        # Unwrapped decode for hot loops that handle errors themselves (raises the library's own error)
+        self.decode_raw = self._decode
+
+    def decode(self, data: Union[bytes, bytearray]) -> Dict[str, Any]:
         """
         Decode message.
 
         Args:
-            data: Encoded bytes
+            data: Encoded bytes (a bytearray is decoded in place, without a copy)
 
         Returns:
             Decoded dict
@@ -70,9 +114,6 @@ class MessageDecoder:
             EncodingError: Decoding failed
         """
         try:
-            if self.encoding == "json":
-                return json.loads(data.decode('utf-8'))
-            else:  # msgpack
-                return msgpack.unpackb(data, raw=False)
+            return self._decode(data)
         except Exception as e:
             raise EncodingError(f"Failed to decode message: {e}")
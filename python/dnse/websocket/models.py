@@ -1,17 +1,39 @@
 """Data models for market data and private channel updates.
 
 This module provides typed data models for all message types:
-- Market data: Trade, Quote, OHLC, ExpectedPrice, TradeExtra, SecurityDefinition
+- Market data: Trade, Quote, TopOfBook, OHLC, ExpectedPrice, TradeExtra, SecurityDefinition
 - Private channels: Order, Position, AccountUpdate
 
 All models support parsing from both abbreviated (MessagePack) and full (JSON) field names.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from decimal import Decimal
 from typing import Optional, List, Dict, Any, Tuple
 
+# __slots__ instead of a per-instance __dict__ where dataclass supports it (Python 3.10+).
+# Not frozen: dispatch sets receivedAt after from_dict for nested payloads.
+_DATACLASS_OPTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Millisecond epoch -> seconds (multiply instead of divide)
+_MS_TO_S = 0.001
+
+
+def _intern(v: Any) -> Any:
+    """Intern str values (symbols/ISINs repeat on every tick); pass anything else through."""
+    return sys.intern(v) if type(v) is str else v
+
+
+def _to_decimal(v: Any) -> Decimal:
+    """Decimal from a wire value; only floats go through str() (shortest repr, not the binary expansion)."""
+    t = type(v)
+    if t is str or t is int:
+        return Decimal(v)
+    return Decimal(str(v))
+
 
 def parse_timestamp(v: Any, date_only: bool = False) -> Optional[str]:
     """Parse various timestamp formats into string with milliseconds.
@@ -24,6 +46,18 @@ def parse_timestamp(v: Any, date_only: bool = False) -> Optional[str]:
     Returns:
         Timestamp string with format "YYYY-MM-DD HH:MM:SS.mmm" or None
     """
+    # Ticks in the same batch share timestamps: formatting of hashable inputs is memoized
+    if isinstance(v, (str, int, float)):
+        return _format_timestamp(v, date_only)
+    return _parse_timestamp(v, date_only)
+
+
+@lru_cache(maxsize=4096)
+def _format_timestamp(v: Any, date_only: bool) -> Optional[str]:
+    return _parse_timestamp(v, date_only)
+
+
+def _parse_timestamp(v: Any, date_only: bool) -> Optional[str]:
     try:
         if v is None:
             return None
@@ -45,7 +79,7 @@ def parse_timestamp(v: Any, date_only: bool = False) -> Optional[str]:
         if isinstance(v, (int, float)):
             # If already in milliseconds (>1e12), convert to seconds
             if v > 1e12:
-                dt = datetime.fromtimestamp(v / 1000)
+                dt = datetime.fromtimestamp(v * _MS_TO_S)
             else:
                 dt = datetime.fromtimestamp(v)
             if date_only:
@@ -54,7 +88,7 @@ def parse_timestamp(v: Any, date_only: bool = False) -> Optional[str]:
     except Exception:
         return None
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PriceLevel:
     price: float
     quantity: int
@@ -67,7 +101,7 @@ class PriceLevel:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Trade:
     marketId: str
     boardId: str
@@ -89,8 +123,8 @@ class Trade:
         return cls(
             marketId=data.get("marketId"),
             boardId=data.get("boardId"),
-            isin=data.get("isin"),
-            symbol=data.get("symbol"),
+            isin=_intern(data.get("isin")),
+            symbol=_intern(data.get("symbol")),
             price=data.get("matchPrice"),
             quantity=data.get("matchQtty"),
             totalVolumeTraded=data.get("totalVolumeTraded"),
@@ -104,7 +138,7 @@ class Trade:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class TradeExtra:
     marketId: str
     boardId: str
@@ -128,8 +162,8 @@ class TradeExtra:
         return cls(
             marketId=data.get("marketId"),
             boardId=data.get("boardId"),
-            isin=data.get("isin"),
-            symbol=data.get("symbol"),
+            isin=_intern(data.get("isin")),
+            symbol=_intern(data.get("symbol")),
             price=data.get("matchPrice"),
             quantity=data.get("matchQtty"),
             side=data.get("side"),
@@ -145,7 +179,7 @@ class TradeExtra:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class ForeignInvestor:
     marketId: str
     boardId: str
@@ -174,7 +208,7 @@ class ForeignInvestor:
             marketId=data.get("marketId"),
             boardId=data.get("boardId"),
             tradingSessionId=data.get("tradingSessionId"),
-            symbol=data.get("symbol"),
+            symbol=_intern(data.get("symbol")),
             transactTime=data.get("transactTime"),
             foreignInvestorTypeCode=data.get("foreignInvestorTypeCode"),
             sellVolume=data.get("sellVolume"),
@@ -191,7 +225,7 @@ class ForeignInvestor:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class MarketIndex:
     indexName: str
 
@@ -264,7 +298,7 @@ class MarketIndex:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class EstimatedMarketIndex:
     indexName: str
     changedRatio: float
@@ -296,7 +330,7 @@ class EstimatedMarketIndex:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class ExpectedPrice:
     marketId: str
     boardId: str
@@ -313,8 +347,8 @@ class ExpectedPrice:
         return cls(
             marketId=data.get("marketId"),
             boardId=data.get("boardId"),
-            isin=data.get("isin"),
-            symbol=data.get("symbol"),
+            isin=_intern(data.get("isin")),
+            symbol=_intern(data.get("symbol")),
             closePrice=data.get("closePrice"),
             expectedTradePrice=data.get("expectedTradePrice"),
             expectedTradeQuantity=data.get("expectedTradeQuantity"),
@@ -323,7 +357,7 @@ class ExpectedPrice:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class SecurityDefinition:
     marketId: str
     boardId: str
@@ -347,10 +381,10 @@ class SecurityDefinition:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "SecurityDefinition":
         return cls(
-            symbol=data.get("symbol"),
+            symbol=_intern(data.get("symbol")),
             marketId=data.get("marketId"),
             boardId=data.get("boardId"),
-            isin=data.get("isin"),
+            isin=_intern(data.get("isin")),
             productGrpId=data.get("productGrpId"),
             securityGroupId=data.get("securityGroupId"),
             basicPrice=data.get("basicPrice"),
@@ -368,7 +402,7 @@ class SecurityDefinition:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Order:
     id: str
     side: str
@@ -401,7 +435,7 @@ class Order:
             id=data.get("id"),
             side=data.get("side"),
             accountNo=data.get("accountNo"),
-            symbol=data.get("symbol"),
+            symbol=_intern(data.get("symbol")),
 
             price=float(data.get("price")),
             priceSecure=float(data.get("priceSecure")),
@@ -425,7 +459,7 @@ class Order:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Position:
     id: int
     accountNo: str
@@ -453,7 +487,7 @@ class Position:
         return cls(
             id=data.get("id"),
             accountNo=data.get("accountNo"),
-            symbol=data.get("symbol"),
+            symbol=_intern(data.get("symbol")),
             status=data.get("status"),
             loanPackageId=data.get("loanPackageId"),
             side=data.get("side"),
@@ -473,7 +507,7 @@ class Position:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Quote:
     marketId: str
     boardId: str
@@ -488,19 +522,15 @@ class Quote:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Quote":
-        # Parse bids array
-        bids_data = data.get("bid") or []
-        bids = [PriceLevel.from_dict(level) for level in bids_data]
-
-        # Parse asks array
-        offer_data = data.get("offer") or []
-        offers = [PriceLevel.from_dict(level) for level in offer_data]
+        # Levels built inline (same fields as PriceLevel.from_dict), no classmethod call per level
+        bids = [PriceLevel(level.get("price"), level.get("qtty")) for level in data.get("bid") or ()]
+        offers = [PriceLevel(level.get("price"), level.get("qtty")) for level in data.get("offer") or ()]
 
         return cls(
-            symbol=data.get("symbol"),
+            symbol=_intern(data.get("symbol")),
             marketId=data.get("marketId"),
             boardId=data.get("boardId"),
-            isin=data.get("isin", ""),
+            isin=_intern(data.get("isin", "")),
             bid=bids,
             offer=offers,
             totalOfferQtty=data.get("totalOfferQtty"),
@@ -529,8 +559,57 @@ class Quote:
             return offer[0] - bid[0]
         return None
 
+    @staticmethod
+    def parse_top_of_book(data: Dict[str, Any]) -> "TopOfBook":
+        """Parse only level 0 of each side, without building the full book."""
+        bids = data.get("bid")
+        offers = data.get("offer")
+        bid = bids[0] if bids else {}
+        offer = offers[0] if offers else {}
+        return TopOfBook(
+            symbol=_intern(data.get("symbol")),
+            boardId=data.get("boardId"),
+            bidPrice=bid.get("price"),
+            bidQuantity=bid.get("qtty"),
+            askPrice=offer.get("price"),
+            askQuantity=offer.get("qtty"),
+            receivedAt=data.get("_receivedAt"),
+        )
+
+
+@dataclass(**_DATACLASS_OPTS)
+class TopOfBook:
+    """Best bid/ask of a Quote, for consumers that never read deeper levels."""
+    symbol: str
+    boardId: str
+    bidPrice: Optional[float]
+    bidQuantity: Optional[int]
+    askPrice: Optional[float]
+    askQuantity: Optional[int]
+    receivedAt: Optional[float] = field(default=None, repr=False)
+
+    @classmethod
+    def from_quote(cls, quote: Quote) -> "TopOfBook":
+        bid = quote.bid[0] if quote.bid else None
+        offer = quote.offer[0] if quote.offer else None
+        return cls(
+            symbol=quote.symbol,
+            boardId=quote.boardId,
+            bidPrice=bid.price if bid else None,
+            bidQuantity=bid.quantity if bid else None,
+            askPrice=offer.price if offer else None,
+            askQuantity=offer.quantity if offer else None,
+            receivedAt=quote.receivedAt,
+        )
+
+    @property
+    def spread(self) -> Optional[float]:
+        if self.bidPrice is None or self.askPrice is None:
+            return None
+        return self.askPrice - self.bidPrice
+
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Ohlc:
     symbol: str
     resolution: str
@@ -553,7 +632,7 @@ class Ohlc:
             return round(float(value), 2)
 
         return cls(
-            symbol=data.get("symbol"),
+            symbol=_intern(data.get("symbol")),
             resolution=data.get("resolution"),
             open=round_value(data.get("open")),
             high=round_value(data.get("high")),
@@ -567,7 +646,7 @@ class Ohlc:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class Session:
     marketId: str
     boardId: str
@@ -590,7 +669,7 @@ class Session:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class AccountUpdate:
     cash: Decimal
     buyingPower: Decimal
@@ -599,7 +678,8 @@ class AccountUpdate:
     timestamp: datetime
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "AccountUpdate":
+    def from_dict(cls, data: Dict[str, Any], _decimal=_to_decimal,
+                  _fromtimestamp=datetime.fromtimestamp) -> "AccountUpdate":
         """Parse account update from message data.
 
         Args:
@@ -611,10 +691,11 @@ class AccountUpdate:
         Example:
             >>> AccountUpdate.from_dict({"c": "10000.00", "bp": "20000.00", ...})
         """
+        # Constructors bound as defaults: local lookups instead of module/builtin lookups
         return cls(
-            cash=Decimal(str(data.get("cash"))),
-            buyingPower=Decimal(str(data.get("buyingPower"))),
-            portfolioValue=Decimal(str(data.get("portfolioValue"))),
-            equity=Decimal(str(data.get("equity"))),
-            timestamp=datetime.fromtimestamp((data.get("timestamp")) / 1000)
+            cash=_decimal(data.get("cash")),
+            buyingPower=_decimal(data.get("buyingPower")),
+            portfolioValue=_decimal(data.get("portfolioValue")),
+            equity=_decimal(data.get("equity")),
+            timestamp=_fromtimestamp(data.get("timestamp") * _MS_TO_S)
         )
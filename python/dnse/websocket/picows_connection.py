@@ -0,0 +1,131 @@
+"""
+Optional WebSocket transport built on picows (C frame parser on top of asyncio).
+
+PicowsConnection exposes the same surface as WebSocketConnection (connect, send,
+receive, receive_many, iter_batches, close, async iteration), so TradingClient can
+switch transports with ``transport="picows"``.
+"""
+
+import logging
+from typing import Optional
+
+from .connection import WebSocketConnection
+from .exceptions import ConnectionError
+
+try:
+    import picows
+except ImportError:  # picows is optional
+    picows = None
+
+logger = logging.getLogger(__name__)
+
+
+class _Listener(picows.WSListener if picows is not None else object):
+    """Reassembles frames into messages and hands them to PicowsConnection."""
+
+    def __init__(self, connection: "PicowsConnection"):
+        super().__init__()
+        self._connection = connection
+        # Fragments are copied straight from the frame buffer, no bytes object per fragment
+        self._buffer = bytearray()
+
+    def on_ws_frame(self, transport, frame) -> None:
+        if self is not self._connection._listener:
+            # Replaced transport: its frames and close code belong to a stream that is gone
+            return
+        msg_type = frame.msg_type
+        if msg_type == picows.WSMsgType.CLOSE:
+            self._connection._close_code = frame.get_close_code()
+            transport.send_close(frame.get_close_code())
+            transport.disconnect()
+            return
+        if msg_type not in (picows.WSMsgType.BINARY, picows.WSMsgType.TEXT, picows.WSMsgType.CONTINUATION):
+            return
+
+        if frame.fin and not self._buffer:
+            self._connection._push(frame.get_payload_as_bytes())
+            return
+
+        self._buffer += frame.get_payload_as_memoryview()
+        if frame.fin:
+            # Hand the assembled bytearray over as-is (decoders take any buffer), no bytes() copy
+            message = self._buffer
+            self._buffer = bytearray()
+            self._connection._push(message)
+
+    def on_ws_disconnected(self, transport) -> None:
+        # A late disconnect from a replaced transport must not close the current stream
+        if self is self._connection._listener:
+            self._connection._on_disconnected()
+
+
+class PicowsConnection(WebSocketConnection):
+    """
+    WebSocketConnection variant using picows for frame parsing.
+
+    Requires the optional ``picows`` package.
+    """
+
+    _connect_errors = WebSocketConnection._connect_errors + (
+        (picows.WSError,) if picows is not None else ()
+    )
+
+    def __init__(self, *args, **kwargs):
+        if picows is None:
+            raise ImportError("transport='picows' requires the picows package: pip install picows")
+        super().__init__(*args, **kwargs)
+        self._reading_paused = False
+        self._listener: Optional[_Listener] = None
+
+    async def _open(self) -> None:
+        # Detach the old transport's listener first so its late callbacks are ignored
+        self._listener = None
+        self._reset_stream()
+        self._reading_paused = False
+        transport, _ = await picows.ws_connect(
+            self._new_listener,
+            self.url,
+            ssl_context=self._get_ssl_context(),
+            websocket_handshake_timeout=self.timeout,
+            enable_auto_ping=self.heartbeat_interval > 0,
+            auto_ping_idle_timeout=self.heartbeat_interval or 30,
+            auto_ping_reply_timeout=self.heartbeat_interval or 30,
+        )
+        self._ws = transport
+        self._tune_socket(transport.underlying_transport)
+
+    def _new_listener(self) -> _Listener:
+        self._listener = _Listener(self)
+        return self._listener
+
+    def _push(self, message: bytes) -> None:
+        self._messages.append(message)
+        if len(self._messages) >= self.max_queue and not self._reading_paused:
+            # Stop reading the socket; the kernel buffer fills and TCP throttles the server
+            self._reading_paused = True
+            self._ws.underlying_transport.pause_reading()
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def send(self, message: bytes) -> None:
+        if not self._ws or not self._is_connected:
+            raise ConnectionError("Not connected")
+
+        self._ws.send(picows.WSMsgType.BINARY, message)
+
+    def _pop(self) -> bytes:
+        message = self._messages.popleft()
+        if self._reading_paused and len(self._messages) <= self.max_queue // 4:
+            self._reading_paused = False
+            self._ws.underlying_transport.resume_reading()
+        return message
+
+    async def close(self) -> None:
+        """Close connection gracefully"""
+        if self._ws and not self._disconnected:
+            self._ws.send_close(picows.WSCloseCode.OK)
+            self._ws.disconnect()
+            await self._ws.wait_disconnected()
+
+        self._is_connected = False
+        logger.info("Connection closed")
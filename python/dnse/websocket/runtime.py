@@ -0,0 +1,35 @@
+"""
+Event loop helpers for running TradingClient applications.
+"""
+
+import asyncio
+from typing import Any, Coroutine
+
+
+def run(main: Coroutine[Any, Any, Any], use_uvloop: bool = True) -> Any:
+    """
+    Run a coroutine on uvloop when it is installed, else on the default asyncio loop.
+
+    uvloop replaces the selector loop with libuv, which speeds up the socket
+    read/TLS path of busy WebSocket streams. It is optional (Linux/macOS only;
+    Windows always runs on asyncio): ``pip install uvloop``.
+
+    Args:
+        main: Coroutine to run, e.g. ``main()``
+        use_uvloop: Set False to force the default asyncio loop even if uvloop is installed
+
+    Returns:
+        The coroutine's result
+    """
+    if not use_uvloop:
+        return asyncio.run(main)
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    if hasattr(uvloop, "run"):
+        return uvloop.run(main)
+    uvloop.install()
+    return asyncio.run(main)
@@ -0,0 +1,58 @@
+import asyncio
+import unittest
+
+import websockets
+
+from dnse.websocket.connection import WebSocketConnection
+from dnse.websocket.picows_connection import PicowsConnection, picows
+
+
+class ReopenTest(unittest.IsolatedAsyncioTestCase):
+    """Reopening must not let the previous socket's reader close the new stream."""
+
+    connection_class = WebSocketConnection
+
+    async def asyncSetUp(self):
+        async def handler(ws):
+            await ws.send("hello")
+            await ws.wait_closed()
+
+        self.server = await websockets.serve(handler, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.conn = self.connection_class(f"ws://127.0.0.1:{port}", heartbeat_interval=0)
+        # Plain ws:// test server: websockets rejects an ssl context there
+        self.conn._get_ssl_context = lambda: None
+
+    async def asyncTearDown(self):
+        await self.conn.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_reopen_keeps_new_stream_open(self):
+        await self.conn.connect()
+        self.assertEqual(await self.conn.receive(), b"hello")
+        old_ws = self.conn._ws
+
+        await self.conn._open()
+        await self._close_transport(old_ws)
+
+        self.assertFalse(self.conn._disconnected)
+        self.assertEqual(await asyncio.wait_for(self.conn.receive(), 5), b"hello")
+
+
+    async def _close_transport(self, ws):
+        await ws.close()
+        await asyncio.sleep(0)
+
+
+@unittest.skipIf(picows is None, "picows not installed")
+class PicowsReopenTest(ReopenTest):
+    connection_class = PicowsConnection
+
+    async def _close_transport(self, ws):
+        ws.disconnect()
+        await ws.wait_disconnected()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ This example shows how to receive real-time market index
 import asyncio
 
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from datetime import datetime
 
 from dnse.websocket.models import EstimatedMarketIndex
@@ -50,4 +51,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
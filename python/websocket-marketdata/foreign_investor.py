@@ -13,6 +13,7 @@ import asyncio
 from datetime import datetime
 
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from dnse.websocket.models import ForeignInvestor
 
 
@@ -52,4 +53,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 import asyncio
 
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from dnse.websocket.models import MarketIndex
 from datetime import datetime
 
@@ -53,4 +54,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
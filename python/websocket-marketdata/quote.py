@@ -13,6 +13,7 @@ import asyncio
 from datetime import datetime
 
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from dnse.websocket.models import Quote
 
 
@@ -51,4 +52,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -13,6 +13,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from dnse.websocket.models import Session
 
 
@@ -51,4 +52,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
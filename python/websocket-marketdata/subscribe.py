@@ -0,0 +1,82 @@
+"""
+Multi-stream subscription example.
+
+Demonstrates:
+- Subscribing to several market data streams over a single connection
+
+One TradingClient (one WebSocket connection, one TLS handshake) carries every
+subscription; messages are dispatched to the handler of their stream.
+
+Usage:
+    python subscribe.py --stream trade --stream ohlc --stream expected_price
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from dnse import TradingClient
+from dnse.websocket.runtime import run
+
+STREAMS = ("trade", "ohlc", "expected_price")
+
+
+def make_handler(label: str):
+    def handle(obj):
+        received_at = datetime.fromtimestamp(obj.receivedAt).strftime("%H:%M:%S.%f")[:-3] if obj.receivedAt else "N/A"
+        print(f"[{received_at}] {label}: {obj}")
+
+    return handle
+
+
+async def main(streams, symbols):
+    # Initialize client
+    encoding = "msgpack"  # json or msgpack
+    client = TradingClient(
+        api_key="api-key",
+        api_secret="api-secret",
+        base_url="wss://ws-openapi.dnse.com.vn",
+        encoding=encoding,
+    )
+
+    # Connect to gateway
+    print("Connecting to WebSocket gateway...")
+    await client.connect()
+    print(f"Connected! Session ID: {client._session_id}\n")
+
+    print(f"Subscribing to {', '.join(streams)} for {', '.join(symbols)}...")
+    subscriptions = []
+    if "trade" in streams:
+        subscriptions.append(client.subscribe_trades(symbols, on_trade=make_handler("TRADE"),
+                                                     encoding=encoding, board_id="G1"))
+    if "ohlc" in streams:
+        subscriptions.append(client.subscribe_ohlc(symbols, resolution="1", on_ohlc=make_handler("OHLC"),
+                                                   encoding=encoding))
+    if "expected_price" in streams:
+        subscriptions.append(client.subscribe_expected_price(symbols, on_expected_price=make_handler("EXPECTED PRICE"),
+                                                             encoding=encoding, board_id="G1"))
+    await asyncio.gather(*subscriptions)
+
+    print("\nReceiving market data (will run for 8 hours)...\n")
+
+    # Run for 8H to collect data
+    # In a real application, you might run indefinitely or until a specific condition
+    await asyncio.sleep(8 * 60 * 60)
+
+    # Disconnect gracefully
+    print("\n\nDisconnecting...")
+    await client.disconnect()
+    print("Disconnected!")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Subscribe to several market data streams on one connection")
+    parser.add_argument("--stream", action="append", choices=STREAMS,
+                        help="Stream to subscribe to (repeatable, default: all)")
+    parser.add_argument("--symbols", nargs="+", default=["SSI", "41I1G4000"])
+    args = parser.parse_args()
+    run(main(args.stream or list(STREAMS), args.symbols))
@@ -15,6 +15,7 @@ import asyncio
 from datetime import datetime
 
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from dnse.websocket.models import Trade
 
 
@@ -38,6 +39,9 @@ async def main():
     print(f"Connected! Session ID: {client._session_id}\n")
 
     print("Subscribing to trades for SSI and 41I1G4000...")
+    # handle_trade runs inline on the event loop (lowest latency). For heavy callbacks
+    # (pandas/NumPy work), pass executor=ThreadPoolExecutor() so they run off the loop;
+    # each trade then pays a thread hand-off and callbacks may run out of order.
     await client.subscribe_trades(["SSI", "41I1G4000"], on_trade=handle_trade, encoding=encoding, board_id="G1")
 
     print("\nReceiving market data (will run for 1 hour)...\n")
@@ -53,4 +57,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
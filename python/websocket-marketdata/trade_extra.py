@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 import asyncio
 from datetime import datetime
 from dnse import TradingClient
+from dnse.websocket.runtime import run
 from dnse.websocket.models import TradeExtra
 
 
@@ -52,4 +53,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())